@@ -7,7 +7,12 @@
 
 import math #just needed for examples section
 
-def binary_search(func, target_output, lower, upper, tolerance = 0.0001, max_iter = 50):
+try:
+    import numba
+except ImportError:
+    numba = None
+
+def binary_search(func, target_output, lower, upper, tolerance = 0.0001, max_iter = 50, integer = False, verbose = False):
     ''' Performs binary search to find value of x such that:
     target_output = func(x)
     or alternatively: x = func^-1(target_output)
@@ -21,27 +26,108 @@ def binary_search(func, target_output, lower, upper, tolerance = 0.0001, max_ite
     Optional Arguments:
         tolerance {float} -- Once abs(func(x) - target_output) < tolerance, then the search stops
         max_iter {int} -- Maximum number of binary search iterations (to prevent infinite loop if no convergance)
+        integer {bool} -- Search over integer x only. Bounds must be ints; midpoints use pure
+                            integer shifts (no float drift) and the search stops exactly when
+                            the bracket can't shrink any further
+        verbose {bool} -- Print the guess/bounds every iteration. Off by default - printing
+                            costs far more than the search itself when func is cheap
     '''
 
-    if abs(lower) > abs(upper):
-        upper, lower = lower, upper #swap upper and lower
+    #check the endpoints first - if either is already within tolerance we're done,
+    #no need to spin through the bisection loop at all
+    fl = func(lower)
+    fu = func(upper)
+    if abs(fl - target_output) < tolerance:
+        return lower
+    if abs(fu - target_output) < tolerance:
+        return upper
+
+    #sort the bracket by function value, not by abs(bound) - swapping on abs() broke
+    #the ordering invariant for brackets like (-8, -6)
+    if fl > fu:
+        lower, upper = upper, lower
+        fl, fu = fu, fl
+
+    #if target_output isn't between func(lower) and func(upper), a monotonic func
+    #can't reach it - return the closer endpoint instead of iterating max_iter times
+    if (fl - target_output) * (fu - target_output) > 0:
+        print(f'[WARNING] -- target_output ({target_output}) is outside [func(lower), func(upper)] = [{fl}, {fu}]. Returning nearest endpoint.')
+        return lower if abs(fl - target_output) < abs(fu - target_output) else upper
+
+    if integer:
+        #integer bisection: midpoint via shift instead of a float divide, and exact
+        #termination once lower/upper are adjacent - no tolerance oscillation possible
+        while abs(upper - lower) > 1:
+            guess = (lower + upper) >> 1
+            residual = func(guess) - target_output
+            if -tolerance < residual < tolerance:
+                return guess
 
-    guess = (lower + upper) / 2
+            cond = residual < 0
+            lower = guess if cond else lower
+            upper = upper if cond else guess
+
+        #bracket is down to adjacent integers - return whichever is closer to the target
+        return lower if abs(func(lower) - target_output) <= abs(func(upper) - target_output) else upper
+
+    guess = (lower + upper) * 0.5
     for i in range(max_iter):
-        estimate = func(guess)
-        #print(f'Iter {i} Guess {guess} F(guess) = {estimate}, L = {lower}, U = {upper}')
-        if abs(target_output - estimate) < tolerance:
+        #compute the signed residual once per iteration - both the convergence check
+        #and the bound update branch on it, so no second subtraction or abs() needed
+        residual = func(guess) - target_output
+        if verbose:
+            print(f'Iter {i} Guess {guess} F(guess) = {residual + target_output}, L = {lower}, U = {upper}')
+        if -tolerance < residual < tolerance:
             return guess
 
-        if estimate < target_output:
-            lower = guess
-            guess = (lower + upper)/2   
-        else:
-            upper = guess
-            guess = (lower + upper)/2
+        #branchless bound update: move lower up if we undershot, else move upper down
+        #(*0.5 instead of /2 to skip the float divide)
+        cond = residual < 0
+        lower = guess if cond else lower
+        upper = upper if cond else guess
+        guess = (lower + upper) * 0.5
 
     return guess
 
+
+if numba is not None:
+    @numba.njit
+    def binary_search_numba(func, target_output, lower, upper, tolerance = 0.0001, max_iter = 50):
+        ''' JIT-compiled version of binary_search for cheap numeric func's, where Python
+        interpreter overhead dominates the actual function work.
+
+        func must itself be numba-compiled (decorate it with @numba.njit) so the whole
+        search loop runs as native code with no Python round-trips per iteration.
+        Arguments are the same as binary_search.
+        '''
+
+        #same endpoint early-exit and bracket ordering as the pure-Python version
+        fl = func(lower)
+        fu = func(upper)
+        if abs(fl - target_output) < tolerance:
+            return lower
+        if abs(fu - target_output) < tolerance:
+            return upper
+        if fl > fu:
+            lower, upper = upper, lower
+
+        guess = (lower + upper) * 0.5
+        for i in range(max_iter):
+            residual = func(guess) - target_output
+            if -tolerance < residual < tolerance:
+                return guess
+
+            cond = residual < 0
+            lower = guess if cond else lower
+            upper = upper if cond else guess
+            guess = (lower + upper) * 0.5
+
+        return guess
+else:
+    def binary_search_numba(func, target_output, lower, upper, tolerance = 0.0001, max_iter = 50):
+        raise ImportError('binary_search_numba requires numba (pip install numba). Use binary_search instead.')
+
+
 if __name__ == '__main__':
 
     ########################################
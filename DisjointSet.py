@@ -1,89 +1,138 @@
 ''' This file contains 2 implementations of a Disjoint Set data structure.
 
 Implementation #1 (class DisjointSet):
-    Represents a single level uptree data structure using a list of lists/ints
-    lists represent sets, ints represent pointers to sets
+    Represents an uptree as flat parent/rank lists. find() uses path halving and
+    union() uses union-by-rank, so both are amortized near-constant time.
 
 Implementation #2 (class DisjointSetNumpy):
-    Represents a single level uptree data structure with a numpy array. 
-    Union operation is slightly less efficient for very large disjoint sets.
+    Same parent/rank forest backed by numpy arrays (int32 parents, uint8 ranks),
+    with the find() loop compiled by numba when it's installed.
 '''
 
 import numpy as np
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def _find(parent, x):
+    ''' Path halving find on a flat parent array. Kept at module level so numba
+    can compile it (arrays in, int out - no object mode needed).'''
+
+    while parent[x] != x:
+        parent[x] = parent[parent[x]]
+        x = parent[x]
+    return x
+
+if numba is not None:
+    _find = numba.njit(cache = True)(_find)
+
 class DisjointSet:
 
     def __init__(self, initial_size = 0):
-        ''' Representing disjoint set using an UpTree structure. Using a single level uptree instead of multilevel.
+        ''' Representing disjoint set using an UpTree structure stored as two flat lists:
+        parent[i] is the index of i's parent (roots point to themselves), and rank[i]
+        is an upper bound on the height of the tree rooted at i.
 
-        Using a list of lists/ints, structure to store the disjoint set structure
-        lists are disjoint set groupings, ints are index pointers to their respective groupings '''
+        With path halving in find() and union-by-rank in union(), both operations are
+        amortized O(alpha(n)) - effectively constant time. '''
 
-        if initial_size > 0:
-            self.sets = [[i] for i in range(initial_size)]
-        else:
-            self.sets = []
+        self.parent = list(range(initial_size))
+        self.rank = [0] * initial_size
 
     def __getitem__(self, idx):
         ''' Magic method to allow indexing into the disjoint set like this:
-        myDisjointSet[my_index] 
+        myDisjointSet[my_index]
 
-        Returns the set associated with the input index.
+        Returns the root index of the set containing the input index.
         '''
 
-        if isinstance(self.sets[idx], int):
-            return self.sets[self.sets[idx]] #if index is pointer, return set it points to
-        else:
-            return self.sets[idx] #if index is a set, return the set
+        return self.find(idx)
 
     def __str__(self):
         ''' Magic method to print internal state of object like this:
         print(myDisjointSet)'''
 
-        return str(self.sets) 
+        return str(self.parent)
 
     def addIndex(self):
-        ''' Use this function to add an index to the disjoint set. 
+        ''' Use this function to add an index to the disjoint set.
         Use the initial_size argument to initialize disjoint set with many indicies.'''
 
-        self.sets.append([len(self.sets)])
+        self.parent.append(len(self.parent))
+        self.rank.append(0)
 
-    def union(self, i1, i2):
-        ''' Set union the sets including indicies i1 and i2 and update pointers to maintain
-        a single level uptree'''
+    def find(self, x):
+        ''' Return the root index of the set containing x.
 
-        #if either i1 or i2 are points, replace their value with the pointer
-        if isinstance(self.sets[i1], int):
-            i1 = self.sets[i1]
-        if isinstance(self.sets[i2], int):
-            i2 = self.sets[i2]
+        Uses path halving (point every other node on the search path at its
+        grandparent), which keeps trees flat without a second pass.'''
 
-        if i1 == i2: #check if i1 and i2 point to the same set, if so we're done
-            return
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, i1, i2):
+        ''' Set union the sets including indicies i1 and i2 using union-by-rank:
+        the root of the shorter tree is attached under the root of the taller one.
+
+        Linking by rank (rather than by index order) keeps trees balanced on any
+        insertion order, and together with path halving in find() gives the
+        inverse-Ackermann amortized bound.'''
 
-        i1, i2 = min(i1,i2), max(i1,i2) #check to make sure i1 <= i2, this is an UPtree after all
+        r1 = self.find(i1)
+        r2 = self.find(i2)
 
-        self.sets[i1].extend(self.sets[i2])
+        if r1 == r2: #check if i1 and i2 are in the same set, if so we're done
+            return
 
-        #update pointers to avoid multi-level uptree, and keep only single level uptree
-        #update values for the whole set to avoid pointers to other pointers (multilevel uptree)
-        #first value in self.sets[i1] is a self reference to top level set, so can't update it without deleting the set
-        for i in self.sets[i1][1:]:
-            self.sets[i] = i1
+        if self.rank[r1] < self.rank[r2]:
+            self.parent[r1] = r2
+        elif self.rank[r1] > self.rank[r2]:
+            self.parent[r2] = r1
+        else: #equal ranks - pick one, its rank grows by 1
+            self.parent[r2] = r1
+            self.rank[r1] += 1
 
 
 class DisjointSetNumpy:
 
     def __init__(self, initial_size = 0):
-        self.sets = np.arange(initial_size)
-        
+        #int32 parents + uint8 ranks (rank <= log2(n), so a byte is plenty)
+        self.parent = np.arange(initial_size, dtype = np.int32)
+        self.rank = np.zeros(initial_size, dtype = np.uint8)
+
+    def __getitem__(self, idx):
+        ''' Returns the root index of the set containing the input index.'''
+        return _find(self.parent, idx)
+
+    def __str__(self):
+        return str(self.parent)
+
     def addItem(self):
         ''' Add an index to the disjoint set'''
-        self.sets.append(len(sets))
+        self.parent = np.append(self.parent, np.int32(len(self.parent)))
+        self.rank = np.append(self.rank, np.uint8(0))
 
-    def union(self,i1, i2):
+    def union(self, i1, i2):
         ''' Unions sets containing indicies i1 and i2.
-            
-            Very simple code, but union is linear instead of constant time update.
+
+            Amortized O(alpha(n)) via path halving find + union-by-rank, instead of
+            the old O(n) boolean-mask scan over the whole array per union.
         '''
-        self.sets[self.sets == self.sets[(max(i1,i2))]] = self.sets[min(i1,i2)]
+        r1 = _find(self.parent, i1)
+        r2 = _find(self.parent, i2)
+
+        if r1 == r2:
+            return
+
+        if self.rank[r1] < self.rank[r2]:
+            self.parent[r1] = r2
+        elif self.rank[r1] > self.rank[r2]:
+            self.parent[r2] = r1
+        else:
+            self.parent[r2] = r1
+            self.rank[r1] += 1
@@ -7,13 +7,22 @@ Solver can also be configured to use any combination of allowable functions. Cur
 does addition, subtraction, multiplication, division, factorial and sqrt.
 - Modify the join_functions list to add functions with 2 inputs and 1 output.
 - Modify the inplace_modifier_functions list to add functions with 1 input and 1 output.
+
+find_combinations_numpy() is a vectorized alternative (requires numpy, --numpy on the
+command line) that mutates a whole BFS generation at a time with array ops. It's faster
+on large searches but only supports the built-in function set above.
 '''
 
-import queue
 import math
+from collections import deque
 from pprint import pprint
 import operator #for basic Python functions. Docs: https://docs.python.org/3/library/operator.html#module-operator
 
+try:
+    import numpy as np
+except ImportError:
+    np = None #only needed for find_combinations_numpy
+
 
 def find_combinations(starting_tuple = (3,3,3), output_lower_bound = 0, output_upper_bound = 10, max_iter = 1000):
     ''' Uses a breadth first search to search the space of possible tuple mutations.
@@ -42,63 +51,40 @@ def find_combinations(starting_tuple = (3,3,3), output_lower_bound = 0, output_u
 
     #These functions have 1 input and 1 output
     inplace_modifier_functions = [
-        math.factorial,
-        math.sqrt,
+        cached_factorial,
+        cached_sqrt,
     ]
     #########################################################
 
-    q = queue.SimpleQueue()
-    q.put(starting_tuple)
+    #deque instead of queue.SimpleQueue - the search is single threaded, so no need
+    #to pay for a lock acquire/release on every put/get
+    q = deque([starting_tuple])
 
+    #tuple_library doubles as the BFS visited-set and the parent map for printing solution
+    #paths. It has to stay one dict: the backtrace below walks parent links through
+    #intermediate tuples, so splitting it into a set plus a solutions-only parent dict
+    #would save memory but lose the ability to reconstruct paths
     tuple_library = {starting_tuple: None}
 
     i = 0
-    while not q.empty():
+    while q:
         i += 1
         if i >= max_iter:
             print('Exceeded iteration limit. Breaking search.')
             break
 
-        tuple_to_mutate = q.get()
-        new_tuple_list = []
-        if len(tuple_to_mutate) > 1: 
-            #create all mutations of the tuple_to_mutate that can be created with functions in list join_functions
-            for func in join_functions:             
-                for idx in range(len(tuple_to_mutate) - 1):
-                    
-                    try:
-                        #generate next tuple via mutating with a joining function
-                        new_tuple = (*tuple_to_mutate[0:idx],
-                                    func(tuple_to_mutate[idx], tuple_to_mutate[idx + 1]),
-                                    *tuple_to_mutate[idx+2:]
-                                    )
-
-                        new_tuple_list.append(new_tuple)
-                    except ZeroDivisionError:
-                        pass  #catch zero divides, and zero mod() divides
-                    except Exception as e:
-                        print(f'[ERROR] -- Error in join_function {func}: {e}')
-
-        #create all mutations of the tuple to mutate, this time using only inplace modifier functions
-        for func in inplace_modifier_functions:
-            for idx in range(len(tuple_to_mutate)):
-
-                val = func(tuple_to_mutate[idx])
-                if float(val).is_integer(): #add this check so sqrt(4) -> 2 (int) instead of 2.0 (float)
-                    val = int(val)
-
-                new_tuple = (*tuple_to_mutate[0:idx], 
-                            val,
-                            *tuple_to_mutate[idx+1:])
-                
-                new_tuple_list.append(new_tuple)
+        tuple_to_mutate = q.popleft()
 
         #check if mutations are valid and undiscovered, if they are, add them to tuple library and queue for future mutation
-        for new_tuple in new_tuple_list:
-            if new_tuple not in tuple_library.keys():
+        #mutations are generated lazily - each candidate is produced, checked, and either
+        #kept or discarded without ever building an intermediate list of all mutations
+        for new_tuple in generate_mutations(tuple_to_mutate, join_functions, inplace_modifier_functions):
+            if new_tuple not in tuple_library: #membership test on the dict directly, no .keys() view
 
                 # check if we converged to a new integer solution, then print out our discovery!
-                if len(new_tuple) == 1 and new_tuple[0] is not None and float(new_tuple[0]).is_integer(): 
+                #(type check first - the int fast path avoids a float allocation per candidate)
+                if len(new_tuple) == 1 and new_tuple[0] is not None \
+                        and (type(new_tuple[0]) is int or new_tuple[0].is_integer()):
                     if output_lower_bound<= new_tuple[0] <= output_upper_bound:
                         print(f'Discovered {new_tuple[0]}')
                         temp = tuple_to_mutate
@@ -107,7 +93,7 @@ def find_combinations(starting_tuple = (3,3,3), output_lower_bound = 0, output_u
                             temp = tuple_library[temp]
                         print('')
 
-                        q.put(new_tuple) #we do want to add the tuple back to the queue because inplace operations can still be used
+                        q.append(new_tuple) #we do want to add the tuple back to the queue because inplace operations can still be used
 
                     tuple_library[new_tuple] = tuple_to_mutate #add to library of tuples discovered
                     continue
@@ -116,12 +102,173 @@ def find_combinations(starting_tuple = (3,3,3), output_lower_bound = 0, output_u
                 #add to the queue of new tuples for future mutation
                 if validate_tuple(new_tuple):
                     tuple_library[new_tuple] = tuple_to_mutate
-                    q.put(new_tuple)
+                    q.append(new_tuple)
 
     #pprint(tuple_library) #pretty print the final library of all discovered tuples
     print(f'Completed after {i} iterations')
 
 
+def find_combinations_numpy(starting_tuple = (3,3,3), output_lower_bound = 0, output_upper_bound = 10, max_iter = 1000):
+    ''' Vectorized alternative to find_combinations (same idea as DisjointSetNumpy vs DisjointSet).
+
+    Instead of mutating one dequeued tuple at a time, this packs each BFS generation into
+    2D numpy arrays (one per tuple length) and computes every join mutation for the whole
+    generation with elementwise array ops. Factorial and sqrt become table lookups on the
+    packed array. Only the built-in function set is supported - there are no pluggable
+    function lists here, that's the price of vectorizing.
+
+    Discoveries and iteration accounting happen per generation rather than per tuple, so
+    print order and the final iteration count can differ from find_combinations, but the
+    discovered solutions and paths are equivalent.
+
+    Arguments are the same as find_combinations.
+    '''
+    assert np is not None, 'find_combinations_numpy requires numpy (pip install numpy). Use find_combinations instead.'
+    assert output_lower_bound <= output_upper_bound
+
+    min_value, max_value = 0, 100 #same pruning range as validate_tuple
+
+    #lookup tables indexed by value: -1 marks results validate_tuple would reject
+    factorial_table = np.full(max_value + 1, -1, dtype = np.int64)
+    for x, fact in _FACTORIAL.items():
+        factorial_table[x] = fact
+    factorial_table[1] = factorial_table[2] = -1 #identity inputs, mutation is a duplicate
+
+    sqrt_table = np.full(max_value + 1, -1, dtype = np.int64)
+    for square, root in _PERFECT_SQUARES.items():
+        if square <= max_value:
+            sqrt_table[square] = root
+
+    tuple_library = {starting_tuple: None}
+    frontier = [starting_tuple]
+
+    i = 0
+    while frontier:
+        if i >= max_iter:
+            print('Exceeded iteration limit. Breaking search.')
+            break
+        i += len(frontier)
+
+        #group the generation by tuple length so each group packs into one (N, k) array
+        groups = {}
+        for t in frontier:
+            groups.setdefault(len(t), []).append(t)
+
+        #candidate batches: (rows, per-row validity mask, parent tuples aligned with rows)
+        candidates = []
+        for k, group in groups.items():
+            arr = np.array(group, dtype = np.int64)
+            all_ok = np.ones(len(group), dtype = bool)
+
+            if k > 1:
+                #join mutations: each adjacent pair collapses to one value, for every row at once
+                for idx in range(k - 1):
+                    x, y = arr[:, idx], arr[:, idx + 1]
+
+                    #exact division only, like special_divide (masked instead of None)
+                    safe_y = np.where(y == 0, 1, y)
+                    div_ok = (y != 0) & (x % safe_y == 0)
+
+                    results = [(x + y, all_ok), (x - y, all_ok), (x * y, all_ok),
+                                (np.where(div_ok, x // safe_y, -1), div_ok)]
+
+                    for res, ok in results:
+                        rows = np.concatenate([arr[:, :idx], res[:, None], arr[:, idx+2:]], axis = 1)
+                        candidates.append((rows, ok, group))
+
+            #inplace mutations via table lookup (values are pre-validated into table range,
+            #except enqueued single-value solutions which may lie outside - mask those)
+            in_range = (arr >= min_value) & (arr <= max_value)
+            looked_up = np.clip(arr, min_value, max_value)
+            for table in (factorial_table, sqrt_table):
+                vals = np.where(in_range, table[looked_up], -1)
+                for idx in range(k):
+                    ok = vals[:, idx] >= 0
+                    rows = arr.copy()
+                    rows[:, idx] = vals[:, idx]
+                    candidates.append((rows, ok, group))
+
+        frontier = []
+        for rows, ok, parents in candidates:
+            if rows.shape[1] == 1:
+                #single-value candidates are potential solutions - same handling as the
+                #scalar solver: print + backtrace if in bounds, and only then re-enqueue
+                for row_ok, value, parent in zip(ok.tolist(), rows[:, 0].tolist(), parents):
+                    if not row_ok or (value,) in tuple_library:
+                        continue
+
+                    if output_lower_bound <= value <= output_upper_bound:
+                        print(f'Discovered {value}')
+                        temp = parent
+                        while temp is not None:
+                            print(f'<- {temp} ', end = '')
+                            temp = tuple_library[temp]
+                        print('')
+
+                        frontier.append((value,))
+
+                    tuple_library[(value,)] = parent
+            else:
+                #whole-generation validation in one shot, then dedup the survivors
+                valid = ok & (rows >= min_value).all(axis = 1) & (rows <= max_value).all(axis = 1)
+                for keep, row, parent in zip(valid.tolist(), rows.tolist(), parents):
+                    if not keep:
+                        continue
+                    new_tuple = tuple(row)
+                    if new_tuple not in tuple_library:
+                        tuple_library[new_tuple] = parent
+                        frontier.append(new_tuple)
+
+    print(f'Completed after {i} iterations')
+
+
+def generate_mutations(tuple_to_mutate, join_functions, inplace_modifier_functions):
+    ''' Generator yielding every single-step mutation of tuple_to_mutate.
+
+    Joining functions (2 inputs -> 1 output) are applied to each adjacent pair, then
+    inplace modifier functions (1 input -> 1 output) to each element. Yielding lets the
+    BFS consume each candidate immediately instead of accumulating a per-node list.
+
+    Arguments:
+    tuple_to_mutate {tuple} -- Tuple to generate mutations of
+    join_functions {list} -- Functions with 2 inputs and 1 output, applied to adjacent pairs
+    inplace_modifier_functions {list} -- Functions with 1 input and 1 output, applied per element
+    '''
+
+    #precompute the prefix/suffix slices once - they're reused by every
+    #(function, index) pair below, so no need to re-slice per mutation
+    prefixes = [tuple_to_mutate[:idx] for idx in range(len(tuple_to_mutate))]
+    suffixes = [tuple_to_mutate[idx:] for idx in range(len(tuple_to_mutate) + 1)]
+
+    if len(tuple_to_mutate) > 1:
+        #create all mutations of the tuple_to_mutate that can be created with functions in list join_functions
+        for func in join_functions:
+            for idx in range(len(tuple_to_mutate) - 1):
+
+                try:
+                    #generate next tuple via mutating with a joining function
+                    yield prefixes[idx] \
+                            + (func(tuple_to_mutate[idx], tuple_to_mutate[idx + 1]),) \
+                            + suffixes[idx + 2]
+                except ZeroDivisionError:
+                    pass  #catch zero divides, and zero mod() divides
+                except Exception as e:
+                    print(f'[ERROR] -- Error in join_function {func}: {e}')
+
+    #create all mutations of the tuple to mutate, this time using only inplace modifier functions
+    for func in inplace_modifier_functions:
+        for idx in range(len(tuple_to_mutate)):
+
+            val = func(tuple_to_mutate[idx])
+            if val is None:
+                continue #invalid result, no point building a tuple validate_tuple() will drop
+
+            if float(val).is_integer(): #add this check so sqrt(4) -> 2 (int) instead of 2.0 (float)
+                val = int(val)
+
+            yield prefixes[idx] + (val,) + suffixes[idx + 1]
+
+
 def validate_tuple(t, min_value = 0, max_value = 100):
     ''' Used to prune tuples that are not needed for further mutation in breadth first search.
 
@@ -137,12 +284,38 @@ def validate_tuple(t, min_value = 0, max_value = 100):
 
     for val in t:
         #throw out tuples that don't meet this condition
-        if val is None or not float(val).is_integer() or val < min_value or abs(val) > max_value:
+        #cheapest checks first: None, then type (ints skip the float coercion entirely
+        #since they're trivially integer-valued), then the range limits
+        if val is None:
+            return False
+        if type(val) is not int and not val.is_integer():
+            return False
+        if val < min_value or abs(val) > max_value:
             return False
 
     return True
 
 
+#precomputed lookup tables - the BFS only ever sees small non-negative ints, so there's
+#no reason to recompute factorials (or build giant ints like 100! that validate_tuple
+#immediately throws away) on every dequeue
+_FACTORIAL = {i: math.factorial(i) for i in range(6)} #6! = 720 is already outside any useful range
+_PERFECT_SQUARES = {i*i: i for i in range(32)}
+
+
+def cached_factorial(x):
+    if x == 1 or x == 2:
+        return None #factorial is the identity here, the mutation would just be a duplicate
+
+    return _FACTORIAL.get(x) #None for anything big enough that validate_tuple would prune it
+
+
+def cached_sqrt(x):
+    #only perfect squares survive validate_tuple's integer check, so a table lookup
+    #replaces math.sqrt + the float is_integer round trip
+    return _PERFECT_SQUARES.get(x)
+
+
 def special_divide(x,y):
     if y == 0:
         return None #basically tell validate_tuple() it's invalid
@@ -171,8 +344,10 @@ if __name__ == '__main__':
     parser.add_argument('--lower', type=int, default=0, help='Lower bound for integers solutions to detect.')
     parser.add_argument('--upper', type=int, default=10, help='Upper bound for integers solutions to detect.')
     parser.add_argument('--maxiter', type=int, default=1000, help='Maximum number of tuples to queue in the breadth-first-search. Intended to cap runtime in case of very large search spaces')
+    parser.add_argument('--numpy', action='store_true', help='Use the vectorized numpy solver (built-in function set only)')
     args = parser.parse_args()
 
-    find_combinations(starting_tuple = args.tuple, output_lower_bound = args.lower, output_upper_bound = args.upper)
+    solver = find_combinations_numpy if args.numpy else find_combinations
+    solver(starting_tuple = args.tuple, output_lower_bound = args.lower, output_upper_bound = args.upper)
 
     
\ No newline at end of file
@@ -8,8 +8,9 @@ Intended to be extensible to trinomial model as well (only have to update
 get_binomial_replicating_value_cash() function)
 
 '''
-import queue
-from numpy import linalg
+from collections import deque
+
+import numpy as np
 
 class Node:
     ''' A class that represents the state of a particular node in the tree.
@@ -17,9 +18,14 @@ class Node:
     tree visualization libraries that take JSON data. I chose to use a class
     instaed of a dict because it seemed more descriptive'''
 
-    def __init__(self, parent, current_value, time, children = [], id = None ):
+    #__slots__ drops the per-instance __dict__: roughly 3x less memory per Node and
+    #faster attribute access, which adds up over the O(T^2) lattice nodes
+    __slots__ = ('parent', 'children', 'time', 'current_value', 'id', 'option_value')
+
+    def __init__(self, parent, current_value, time, children = None, id = None ):
         self.parent = parent
-        self.children = children
+        #default to None instead of [] - a mutable default would be shared by every Node
+        self.children = [] if children is None else children
         self.time = time
         self.current_value = current_value
         self.id = id
@@ -43,6 +49,11 @@ class Node:
         else:
             return False
 
+    def __hash__(self):
+        #defining __eq__ alone makes the class unhashable - hash on the same
+        #(time, price) identity so Nodes work in sets/dicts with O(1) membership
+        return hash((self.time, round(self.current_value, 3)))
+
 class OptionPricingTree:
     ''' From initial conditions, builds a tree of Node objects representing the Binomial option price model.
 
@@ -96,6 +107,14 @@ class OptionPricingTree:
         self.risk_free_rate = risk_free_rate_per_period
         self.debug = debug
 
+        #hoist the risk-neutral pricing constants out of the per-node/per-layer math -
+        #they only depend on the model inputs, so compute them once here
+        self._u = max(self.next_step_change)
+        self._d = min(self.next_step_change)
+        self._q = (self.risk_free_rate - self._d) / (self._u - self._d) #risk neutral prob
+        self._one_minus_q = 1 - self._q
+        self._inv_R = 1 / self.risk_free_rate #multiply by this instead of dividing by R
+
         #create the tree, and calculate option values
         self.create_tree()
         self.compute_option_values()
@@ -104,66 +123,107 @@ class OptionPricingTree:
         #initialize root node
         self.all_nodes = [Node(parent = None,
                                 current_value = self.initial_price,
-                                time = 0, 
+                                time = 0,
                                 id = 0)]
 
-        q = queue.SimpleQueue()
-        q.put(0) #put root index in queue
-        
-        while not q.empty():
-            current_node_idx = q.get()
+        #maps (time, current_value) -> node id, so the lattice dedup below is an O(1)
+        #dict lookup instead of a linear scan over all existing nodes
+        self.node_index = {(0, self.initial_price): 0}
+
+        #single-threaded BFS, so use a deque rather than the lock-guarded SimpleQueue
+        q = deque([0]) #put root index in queue
+
+        while q:
+            current_node_idx = q.popleft()
 
             if self.all_nodes[current_node_idx].time < self.time_periods:
                 #add child nodes to parent
                 for multiplier, prob in zip(self.next_step_change, self.next_step_prob):
                     #create child node to add
-                    node_id_to_add = len(self.all_nodes)
-                    node_to_add = Node(parent = current_node_idx,
-                                        current_value = round(self.all_nodes[current_node_idx].current_value * multiplier, 3),
-                                        time = self.all_nodes[current_node_idx].time + 1,
-                                        id = node_id_to_add)
+                    current_value = round(self.all_nodes[current_node_idx].current_value * multiplier, 3)
+                    time = self.all_nodes[current_node_idx].time + 1
 
-                    if node_to_add not in self.all_nodes:
+                    existing_idx = self.node_index.get((time, current_value))
+                    if existing_idx is None:
                         #add the node to our list of all nodes
-                        self.all_nodes.append(node_to_add)
+                        node_id_to_add = len(self.all_nodes)
+                        self.all_nodes.append(Node(parent = current_node_idx,
+                                                    current_value = current_value,
+                                                    time = time,
+                                                    id = node_id_to_add))
+                        self.node_index[(time, current_value)] = node_id_to_add
 
                         #update parent to point to the node we're adding
-                        self.all_nodes[current_node_idx].children = self.all_nodes[current_node_idx].children + [node_id_to_add]
+                        self.all_nodes[current_node_idx].children.append(node_id_to_add)
 
                         #add pointer to our newly created to the queue of nodes to process
-                        q.put(node_id_to_add)
+                        q.append(node_id_to_add)
 
                     else:
                         #Two parent nodes can point to same child in lattice structure
                         #for this to happen, the child will have same current_value and time_step
-                        #in this case, we just point parent to already existing node 
+                        #in this case, we just point parent to already existing node
                         #(don't need to update other parent in this exercise)
-                        self.all_nodes[current_node_idx].children = self.all_nodes[current_node_idx].children + [self.all_nodes.index(node_to_add)]
+                        self.all_nodes[current_node_idx].children.append(existing_idx)
 
 
     def compute_option_values(self):
-        #compute option intrinsic value at each node
-        for idx in range(len(self.all_nodes)):
-            self.all_nodes[idx].option_value = round(self.get_option_intrinsic_value(self.all_nodes[idx]),3)
-
-        
-        #use reversed() to work backward
-        for idx in reversed(range(len(self.all_nodes))):
-            if len(self.all_nodes[idx].children) > 0:
-                #expected value calculation
-                value_of_continuing = self.get_binomial_replicating_value_cash(self.all_nodes[idx])
-                value_of_continuing = round(value_of_continuing, 3) #rounding for display purposes
-                
-                if self.early_exercise:
-                    #handle early stopping in American options
-                    if self.all_nodes[idx].option_value > value_of_continuing:
-                        if self.debug:
-                            print(f'Early exercise on node {idx}. Option value ({self.all_nodes[idx].option_value}) > Value of Continuing ({value_of_continuing})')
-
-                    self.all_nodes[idx].option_value = max(self.all_nodes[idx].option_value, value_of_continuing)
-
-                else: 
-                    self.all_nodes[idx].option_value = value_of_continuing
+        ''' Backward induction on the recombining lattice, one numpy vector per time layer.
+
+        The binomial tree recombines, so layer t only has t+1 unique prices - we can price
+        a whole layer at once with vectorized arithmetic instead of walking Node objects
+        one at a time. Option values are still written back onto the nodes for display.'''
+
+        assert len(self.next_step_change) == 2, 'Method only used for binary trees!'
+
+        #group nodes into layers by time, remembering each node's position in its layer
+        #(position drives the child-value gathers below - prices are rounded per step in
+        #create_tree, so deep layers don't recombine perfectly and can hold more than
+        #t+1 nodes; the child links are the ground truth)
+        layers = [[] for _ in range(self.time_periods + 1)]
+        position = {}
+        for node in self.all_nodes:
+            position[node.id] = len(layers[node.time])
+            layers[node.time].append(node)
+
+        #terminal layer: option value is just the intrinsic value
+        prices = np.array([n.current_value for n in layers[-1]])
+        if self.option_type == 'call':
+            values = np.round(np.maximum(prices - self.strike, 0), 3)
+        else: #put option
+            values = np.round(np.maximum(self.strike - prices, 0), 3)
+
+        for node, option_value in zip(layers[-1], values):
+            node.option_value = option_value
+
+        #work backward one layer at a time
+        for t in reversed(range(self.time_periods)):
+            prices = np.array([n.current_value for n in layers[t]])
+            if self.option_type == 'call':
+                intrinsic = np.round(np.maximum(prices - self.strike, 0), 3)
+            else: #put option
+                intrinsic = np.round(np.maximum(self.strike - prices, 0), 3)
+
+            #gather each node's child option values from the next layer, with q applied
+            #to children[0] - same child ordering as get_binomial_replicating_value_cash
+            up = np.array([position[n.children[0]] for n in layers[t]])
+            down = np.array([position[n.children[1]] for n in layers[t]])
+
+            #expected value calculation, rounding for display purposes
+            value_of_continuing = np.round((self._q * values[up] + self._one_minus_q * values[down]) * self._inv_R, 3)
+
+            if self.early_exercise:
+                #handle early stopping in American options
+                if self.debug:
+                    for j in np.nonzero(intrinsic > value_of_continuing)[0]:
+                        print(f'Early exercise on node {layers[t][j].id}. Option value ({intrinsic[j]}) > Value of Continuing ({value_of_continuing[j]})')
+
+                values = np.maximum(intrinsic, value_of_continuing)
+            else:
+                values = value_of_continuing
+
+            for node, option_value in zip(layers[t], values):
+                node.option_value = option_value
 
     def get_option_intrinsic_value(self, n: Node):
         if self.option_type == 'call':
@@ -173,15 +233,10 @@ class OptionPricingTree:
 
     def get_binomial_replicating_value_cash(self, n: Node):
         assert len(self.next_step_change) == 2, 'Method only used for binary trees!'
-        u = max(self.next_step_change)
-        d = min(self.next_step_change)
-
-        #get risk neutral probs
-        q = (self.risk_free_rate - d) / (u - d)
 
-        #get child expected values
+        #get child expected values (risk neutral probs are precomputed in __init__)
         child_option_values = [self.all_nodes[idx].option_value for idx in n.children]
-        option_value = (q * child_option_values[0] + (1-q) * child_option_values[1]) / self.risk_free_rate
+        option_value = (self._q * child_option_values[0] + self._one_minus_q * child_option_values[1]) * self._inv_R
         return option_value
 
 #########################################################